@@ -19,6 +19,9 @@
 #     NAME name
 #     TARGET target
 #     [DEPENDENCIES dependencies]
+#     [SHARDS count]
+#     [TEST_FRAMEWORK QtTest|Catch2]
+#     [DISCOVER_CASES]
 #     SOURCE_FILES
 #       file1.cpp
 #       file2.cpp
@@ -66,6 +69,73 @@
 #   )
 #
 #
+# Split a test in shards or per test case
+# ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+#
+# A test executable that contains many slow test cases
+# can become the longest test of a ``ctest -j`` run,
+# while other cores are idle.
+#
+# If ``SHARDS`` is given (without ``TEST_FRAMEWORK``),
+# ``count`` tests, named ``name_shard0`` to ``name_shard<count-1>``, are added.
+# Each of them runs the same executable,
+# with the environment variables ``MDT_TEST_SHARD_INDEX`` and ``MDT_TEST_SHARD_COUNT`` set.
+# It is up to the test executable to only run its part of the test cases.
+#
+# Example:
+#
+# .. code-block:: cmake
+#
+#   mdt_add_test(
+#     NAME MyTest
+#     TARGET MyTestTarget
+#     DEPENDENCIES My::LibA
+#     SHARDS 4
+#     SOURCE_FILES
+#       MyTest.cpp
+#   )
+#
+# Qt Test and Catch2 (v2) executables do not know about those variables.
+# For them, use ``DISCOVER_CASES`` together with ``TEST_FRAMEWORK``.
+# If ``SHARDS`` and ``TEST_FRAMEWORK`` are given, ``DISCOVER_CASES`` is implied.
+# Once the test executable is built, its test cases are listed
+# (using ``-functions`` for Qt Test, ``--list-test-names-only`` for Catch2)
+# and a test is added for each of them, named ``name.case``.
+# Each test runs the executable with the test case as argument,
+# which is the filter supported by the framework.
+#
+# If ``SHARDS`` is also given, the test cases are distributed
+# in ``count`` batches, named ``name_shard0`` to ``name_shard<count-1>``.
+#
+# Example:
+#
+# .. code-block:: cmake
+#
+#   mdt_add_test(
+#     NAME MyTest
+#     TARGET MyTestTarget
+#     DEPENDENCIES My::LibA Qt5::Test
+#     TEST_FRAMEWORK QtTest
+#     DISCOVER_CASES
+#     SHARDS 8
+#     SOURCE_FILES
+#       MyTest.cpp
+#   )
+#
+# The test cases are discovered at build time (as a ``POST_BUILD`` step),
+# like the ``gtest_discover_tests()`` function of the CMake GoogleTest module does.
+# Before the test executable is built, a test named ``name_NOT_BUILT`` is listed by CTest.
+#
+# In all cases, each added test gets the environment
+# that :command:`mdt_set_test_library_env_path()` would set.
+# The same environment is also used to run the executable when listing its test cases.
+#
+# Like :command:`add_test()` does, if the test executable has a ``CROSSCOMPILING_EMULATOR``,
+# it is used to list the test cases and to run the tests.
+#
+# Note: test case names containing a ``;`` are not supported.
+#
+#
 # An advice when using Catch2
 # ^^^^^^^^^^^^^^^^^^^^^^^^^^^
 #
@@ -136,12 +206,21 @@
 #
 
 include(MdtRuntimeEnvironment)
+include(MdtProfiling)
+
+# mdt_add_test() can be called from a other directory than the one this module was included from,
+# so the path to the script is not stored in a (directory scoped) variable
+set_property(GLOBAL PROPERTY MDT_ADD_TEST_DISCOVER_CASES_SCRIPT "${CMAKE_CURRENT_LIST_DIR}/MdtAddTestDiscoverCases.cmake")
 
 
 function(mdt_add_test)
 
-  set(options)
-  set(oneValueArgs NAME TARGET)
+  if(MDT_CMAKE_MODULES_PROFILE)
+    mdt_profile_get_timestamp(profileBegin)
+  endif()
+
+  set(options DISCOVER_CASES)
+  set(oneValueArgs NAME TARGET SHARDS TEST_FRAMEWORK)
   set(multiValueArgs DEPENDENCIES SOURCE_FILES)
   cmake_parse_arguments(ARG "${options}" "${oneValueArgs}" "${multiValueArgs}" ${ARGN})
 
@@ -154,18 +233,106 @@ function(mdt_add_test)
   if(NOT ARG_SOURCE_FILES)
     message(FATAL_ERROR "mdt_add_test(): at least one source file expected")
   endif()
+  if(DEFINED ARG_SHARDS AND NOT ARG_SHARDS MATCHES "^[1-9][0-9]*$")
+    message(FATAL_ERROR "mdt_add_test(): SHARDS must be a positive integer, got '${ARG_SHARDS}'")
+  endif()
+  if(ARG_TEST_FRAMEWORK AND NOT ARG_TEST_FRAMEWORK MATCHES "^(QtTest|Catch2)$")
+    message(FATAL_ERROR "mdt_add_test(): unsupported TEST_FRAMEWORK '${ARG_TEST_FRAMEWORK}', expected QtTest or Catch2")
+  endif()
+  if(ARG_DISCOVER_CASES AND NOT ARG_TEST_FRAMEWORK)
+    message(FATAL_ERROR "mdt_add_test(): DISCOVER_CASES requires TEST_FRAMEWORK")
+  endif()
   if(ARG_UNPARSED_ARGUMENTS)
     message(FATAL_ERROR "mdt_add_test(): unknown arguments passed: ${ARG_UNPARSED_ARGUMENTS}")
   endif()
 
+  # Qt Test and Catch2 executables ignore MDT_TEST_SHARD_INDEX and MDT_TEST_SHARD_COUNT,
+  # so each shard would run all test cases
+  if(ARG_TEST_FRAMEWORK AND ARG_SHARDS)
+    set(ARG_DISCOVER_CASES TRUE)
+  endif()
+
   add_executable(${ARG_TARGET} ${ARG_SOURCE_FILES})
 
   if(ARG_DEPENDENCIES)
     target_link_libraries(${ARG_TARGET} PRIVATE ${ARG_DEPENDENCIES})
   endif()
 
-  add_test(NAME ${ARG_NAME} COMMAND ${ARG_TARGET})
+  if(ARG_DISCOVER_CASES)
+
+    get_property(discoverCasesScript GLOBAL PROPERTY MDT_ADD_TEST_DISCOVER_CASES_SCRIPT)
+    if(NOT EXISTS "${discoverCasesScript}")
+      message(FATAL_ERROR "mdt_add_test(): script to discover test cases not found: '${discoverCasesScript}'")
+    endif()
+
+    mdt_target_libraries_to_test_environment_string(envPath TARGET ${ARG_TARGET})
+
+    set(filesBase "${CMAKE_CURRENT_BINARY_DIR}/MdtCMakeFiles/${ARG_TARGET}")
+    set(ctestIncludeFile "${filesBase}_include.cmake")
+
+    get_property(isMultiConfig GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+    if(isMultiConfig)
+      set(ctestTestsFile "${filesBase}_tests-$<CONFIG>.cmake")
+      set(ctestTestsFileForCTest "${filesBase}_tests-\${CTEST_CONFIGURATION_TYPE}.cmake")
+    else()
+      set(ctestTestsFile "${filesBase}_tests.cmake")
+      set(ctestTestsFileForCTest "${ctestTestsFile}")
+    endif()
+
+    set(paramsFile "${filesBase}_discoverCasesParams-$<CONFIG>.cmake")
 
-  mdt_set_test_library_env_path(NAME ${ARG_NAME} TARGET ${ARG_TARGET})
+    set(paramsFileContent "set(MDT_TEST_NAME [==[${ARG_NAME}]==])\n")
+    string(APPEND paramsFileContent "set(MDT_TEST_EXECUTABLE [==[$<TARGET_FILE:${ARG_TARGET}>]==])\n")
+    string(APPEND paramsFileContent "set(MDT_TEST_EXECUTOR [==[$<TARGET_PROPERTY:${ARG_TARGET},CROSSCOMPILING_EMULATOR>]==])\n")
+    string(APPEND paramsFileContent "set(MDT_TEST_FRAMEWORK ${ARG_TEST_FRAMEWORK})\n")
+    string(APPEND paramsFileContent "set(MDT_TEST_SHARDS ${ARG_SHARDS})\n")
+    string(APPEND paramsFileContent "set(MDT_TEST_ENVIRONMENT [==[${envPath}]==])\n")
+    string(APPEND paramsFileContent "set(MDT_TEST_CTEST_FILE [==[${ctestTestsFile}]==])\n")
+
+    file(GENERATE OUTPUT "${paramsFile}" CONTENT "${paramsFileContent}")
+
+    add_custom_command(
+      TARGET ${ARG_TARGET} POST_BUILD
+      COMMAND "${CMAKE_COMMAND}" "-DMDT_TEST_PARAMS_FILE=${paramsFile}" -P "${discoverCasesScript}"
+      COMMENT "Discover test cases of ${ARG_TARGET}"
+      VERBATIM
+    )
+
+    set(ctestIncludeFileContent "if(EXISTS \"${ctestTestsFileForCTest}\")\n")
+    string(APPEND ctestIncludeFileContent "  include(\"${ctestTestsFileForCTest}\")\n")
+    string(APPEND ctestIncludeFileContent "else()\n")
+    string(APPEND ctestIncludeFileContent "  add_test(${ARG_NAME}_NOT_BUILT ${ARG_NAME}_NOT_BUILT)\n")
+    string(APPEND ctestIncludeFileContent "endif()\n")
+
+    file(WRITE "${ctestIncludeFile}" "${ctestIncludeFileContent}")
+
+    set_property(DIRECTORY APPEND PROPERTY TEST_INCLUDE_FILES "${ctestIncludeFile}")
+
+  elseif(DEFINED ARG_SHARDS)
+
+    mdt_target_libraries_to_test_environment_string(envPath TARGET ${ARG_TARGET})
+
+    math(EXPR lastShardIndex "${ARG_SHARDS} - 1")
+    foreach(shardIndex RANGE ${lastShardIndex})
+      set(shardTestName "${ARG_NAME}_shard${shardIndex}")
+      add_test(NAME ${shardTestName} COMMAND ${ARG_TARGET})
+      if(envPath)
+        mdt_append_test_environment_variables_string(${shardTestName} "${envPath}")
+      endif()
+      mdt_append_test_environment_variables_string(${shardTestName} "MDT_TEST_SHARD_INDEX=${shardIndex};MDT_TEST_SHARD_COUNT=${ARG_SHARDS}")
+    endforeach()
+
+  else()
+
+    add_test(NAME ${ARG_NAME} COMMAND ${ARG_TARGET})
+
+    mdt_set_test_library_env_path(NAME ${ARG_NAME} TARGET ${ARG_TARGET})
+
+  endif()
+
+  if(MDT_CMAKE_MODULES_PROFILE)
+    list(LENGTH ARG_SOURCE_FILES sourceFilesCount)
+    mdt_profile_record(FUNCTION mdt_add_test BEGIN ${profileBegin} INPUT_SIZE ${sourceFilesCount})
+  endif()
 
 endfunction()
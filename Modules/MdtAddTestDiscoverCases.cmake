@@ -0,0 +1,143 @@
+# Distributed under the OSI-approved BSD 3-Clause License.  See accompanying
+# file Copyright.txt or https://cmake.org/licensing for details.
+
+# Script used by mdt_add_test() when DISCOVER_CASES is given.
+#
+# It is run as a POST_BUILD step of the test executable:
+#
+#   cmake -DMDT_TEST_PARAMS_FILE=<file> -P MdtAddTestDiscoverCases.cmake
+#
+# The parameters file is generated by mdt_add_test() and defines:
+#  - MDT_TEST_NAME: the NAME passed to mdt_add_test()
+#  - MDT_TEST_EXECUTABLE: full path to the test executable
+#  - MDT_TEST_EXECUTOR: the CROSSCOMPILING_EMULATOR of the test executable, can be empty
+#  - MDT_TEST_FRAMEWORK: QtTest or Catch2
+#  - MDT_TEST_SHARDS: number of batches, or empty to register one test per case
+#  - MDT_TEST_ENVIRONMENT: the ENVIRONMENT to attach to each test (already escaped)
+#  - MDT_TEST_CTEST_FILE: the file to generate, that is included by CTest
+#
+# See also the CMake GoogleTest module, which uses the same technique.
+
+cmake_minimum_required(VERSION 3.14)
+
+if(NOT MDT_TEST_PARAMS_FILE)
+  message(FATAL_ERROR "MdtAddTestDiscoverCases: MDT_TEST_PARAMS_FILE missing")
+endif()
+
+include("${MDT_TEST_PARAMS_FILE}")
+
+if(MDT_TEST_FRAMEWORK STREQUAL "QtTest")
+  set(listCasesArguments -functions)
+elseif(MDT_TEST_FRAMEWORK STREQUAL "Catch2")
+  set(listCasesArguments --list-test-names-only)
+else()
+  message(FATAL_ERROR "MdtAddTestDiscoverCases: unsupported test framework '${MDT_TEST_FRAMEWORK}'")
+endif()
+
+# The executable probably needs the same environment than the tests to run
+# (for example, to find the shared libraries it depends on)
+execute_process(
+  COMMAND "${CMAKE_COMMAND}" -E env ${MDT_TEST_ENVIRONMENT} ${MDT_TEST_EXECUTOR} "${MDT_TEST_EXECUTABLE}" ${listCasesArguments}
+  OUTPUT_VARIABLE listOutput
+  ERROR_VARIABLE listError
+  RESULT_VARIABLE listResult
+)
+
+# Catch2 (v2) returns the number of listed test cases
+if(MDT_TEST_FRAMEWORK STREQUAL "Catch2")
+  if(NOT listResult MATCHES "^[0-9]+$")
+    message(FATAL_ERROR "MdtAddTestDiscoverCases: listing test cases of ${MDT_TEST_EXECUTABLE} failed: ${listResult}\n${listError}")
+  endif()
+else()
+  if(NOT listResult EQUAL 0)
+    message(FATAL_ERROR "MdtAddTestDiscoverCases: listing test cases of ${MDT_TEST_EXECUTABLE} failed: ${listResult}\n${listError}")
+  endif()
+endif()
+
+# CMake does not split a list on a ; that is inside [ ], so a test case name
+# with a unbalanced [ or ] would be merged with the following ones.
+# The brackets are replaced with placeholders while handling lists,
+# and restored when writing the CTest file.
+string(ASCII 1 openBracketPlaceholder)
+string(ASCII 2 closeBracketPlaceholder)
+string(REPLACE "[" "${openBracketPlaceholder}" listOutput "${listOutput}")
+string(REPLACE "]" "${closeBracketPlaceholder}" listOutput "${listOutput}")
+
+# Note: test case names containing a ; are not supported
+string(REGEX MATCHALL "[^\r\n]+" lines "${listOutput}")
+
+set(caseFilters)
+foreach(line IN LISTS lines)
+  if(MDT_TEST_FRAMEWORK STREQUAL "QtTest")
+    # Qt Test prints the signature of each test function, like testFoo()
+    if(line MATCHES "^(.+)\\(\\)$")
+      list(APPEND caseFilters "${CMAKE_MATCH_1}")
+    endif()
+  else()
+    if(line)
+      # Catch2 test spec: , separates names and [ starts a tag
+      string(REPLACE "\\" "\\\\" filter "${line}")
+      string(REPLACE "," "\\," filter "${filter}")
+      string(REPLACE "${openBracketPlaceholder}" "\\${openBracketPlaceholder}" filter "${filter}")
+      list(APPEND caseFilters "${filter}")
+    endif()
+  endif()
+endforeach()
+
+set(ctestFileContent "# Generated by MdtAddTestDiscoverCases from ${MDT_TEST_EXECUTABLE}\n\n")
+
+function(mdt_add_test_discover_cases_append_test contentVar testName)
+  set(content "${${contentVar}}")
+  string(APPEND content "add_test([==[${testName}]==]")
+  foreach(executorPart ${MDT_TEST_EXECUTOR})
+    string(APPEND content " [==[${executorPart}]==]")
+  endforeach()
+  string(APPEND content " [==[${MDT_TEST_EXECUTABLE}]==]")
+  foreach(argument ${ARGN})
+    string(APPEND content " [==[${argument}]==]")
+  endforeach()
+  string(APPEND content ")\n")
+  if(MDT_TEST_ENVIRONMENT)
+    string(APPEND content "set_tests_properties([==[${testName}]==] PROPERTIES ENVIRONMENT [==[${MDT_TEST_ENVIRONMENT}]==])\n")
+  endif()
+  set(${contentVar} "${content}" PARENT_SCOPE)
+endfunction()
+
+list(LENGTH caseFilters caseCount)
+
+if(caseCount EQUAL 0)
+  message(WARNING "MdtAddTestDiscoverCases: no test case found in ${MDT_TEST_EXECUTABLE}, register it as a single test")
+  mdt_add_test_discover_cases_append_test(ctestFileContent "${MDT_TEST_NAME}")
+elseif(NOT MDT_TEST_SHARDS)
+  foreach(caseFilter ${caseFilters})
+    string(REPLACE "\\" "" caseName "${caseFilter}")
+    mdt_add_test_discover_cases_append_test(ctestFileContent "${MDT_TEST_NAME}.${caseName}" "${caseFilter}")
+  endforeach()
+else()
+  set(shardCount ${MDT_TEST_SHARDS})
+  if(shardCount GREATER caseCount)
+    set(shardCount ${caseCount})
+  endif()
+  math(EXPR lastShardIndex "${shardCount} - 1")
+  math(EXPR lastCaseIndex "${caseCount} - 1")
+
+  # Distribute the cases round-robin, so each batch gets the same count (+/- 1)
+  foreach(shardIndex RANGE ${lastShardIndex})
+    set(shardFilters)
+    foreach(caseIndex RANGE ${shardIndex} ${lastCaseIndex} ${shardCount})
+      list(GET caseFilters ${caseIndex} caseFilter)
+      list(APPEND shardFilters "${caseFilter}")
+    endforeach()
+    if(MDT_TEST_FRAMEWORK STREQUAL "QtTest")
+      mdt_add_test_discover_cases_append_test(ctestFileContent "${MDT_TEST_NAME}_shard${shardIndex}" ${shardFilters})
+    else()
+      string(REPLACE ";" "," shardSpec "${shardFilters}")
+      mdt_add_test_discover_cases_append_test(ctestFileContent "${MDT_TEST_NAME}_shard${shardIndex}" "${shardSpec}")
+    endif()
+  endforeach()
+endif()
+
+string(REPLACE "${openBracketPlaceholder}" "[" ctestFileContent "${ctestFileContent}")
+string(REPLACE "${closeBracketPlaceholder}" "]" ctestFileContent "${ctestFileContent}")
+
+file(WRITE "${MDT_TEST_CTEST_FILE}" "${ctestFileContent}")
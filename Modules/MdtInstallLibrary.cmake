@@ -657,6 +657,7 @@
 include(MdtTargetProperties)
 include(MdtInstallIncludes)
 include(MdtPackageConfigHelpers)
+include(MdtProfiling)
 
 function(mdt_install_interface_library)
 
@@ -812,6 +813,10 @@ endfunction()
 
 function(mdt_install_library)
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    mdt_profile_get_timestamp(profileBegin)
+  endif()
+
   set(options INCLUDES_FILE_WITHOUT_EXTENSION)
   set(oneValueArgs TARGET RUNTIME_DESTINATION LIBRARY_DESTINATION ARCHIVE_DESTINATION
                   INCLUDES_DIRECTORY INCLUDES_DESTINATION INCLUDES_FILES_MATCHING_PATTERN
@@ -990,4 +995,10 @@ function(mdt_install_library)
     )
   endif()
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    list(LENGTH ARG_OBJECT_TARGETS objectTargetsCount)
+    math(EXPR installedTargetsCount "${objectTargetsCount} + 1")
+    mdt_profile_record(FUNCTION mdt_install_library BEGIN ${profileBegin} INPUT_SIZE ${installedTargetsCount})
+  endif()
+
 endfunction()
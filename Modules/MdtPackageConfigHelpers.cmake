@@ -523,6 +523,7 @@
 
 include(MdtTargetPackageProperties)
 include(CMakePackageConfigHelpers)
+include(MdtProfiling)
 
 
 function(mdt_get_target_export_name out_var target)
@@ -545,6 +546,10 @@ endfunction()
 
 function(mdt_install_package_config_file)
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    mdt_profile_get_timestamp(profileBegin)
+  endif()
+
   set(options)
   set(oneValueArgs TARGETS_EXPORT_FILE FILE DESTINATION COMPONENT)
   set(multiValueArgs TARGETS)
@@ -630,6 +635,11 @@ function(mdt_install_package_config_file)
     ${componentArguments}
   )
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    list(LENGTH ARG_TARGETS targetsCount)
+    mdt_profile_record(FUNCTION mdt_install_package_config_file BEGIN ${profileBegin} INPUT_SIZE ${targetsCount})
+  endif()
+
 endfunction()
 
 
@@ -0,0 +1,178 @@
+# Distributed under the OSI-approved BSD 3-Clause License.  See accompanying
+# file Copyright.txt or https://cmake.org/licensing for details.
+
+# Each profiled function does something like:
+#
+#   if(MDT_CMAKE_MODULES_PROFILE)
+#     mdt_profile_get_timestamp(profileBegin)
+#   endif()
+#   ...
+#   if(MDT_CMAKE_MODULES_PROFILE)
+#     mdt_profile_record(FUNCTION mdt_some_function BEGIN ${profileBegin} INPUT_SIZE ${someSize})
+#   endif()
+#
+# The check is done inline, so that the cost is a single if()
+# when profiling is disabled (the common case).
+#
+# Each call is stored in a global property, named MDT_PROFILE_<function-name>_CALLS,
+# as a list of begin:end:input-size items.
+# The aggregation is only done when writing the report.
+
+if(MDT_CMAKE_MODULES_PROFILE AND NOT CMAKE_SCRIPT_MODE_FILE)
+  get_property(mdtProfileReportIsScheduled GLOBAL PROPERTY MDT_PROFILE_REPORT_IS_SCHEDULED)
+  if(NOT mdtProfileReportIsScheduled)
+    if(CMAKE_VERSION VERSION_GREATER_EQUAL 3.19)
+      cmake_language(DEFER DIRECTORY "${CMAKE_SOURCE_DIR}" CALL mdt_write_profile_report)
+    else()
+      message(WARNING "MdtProfiling: CMake ${CMAKE_VERSION} cannot write the profile report automatically, call mdt_write_profile_report() at the end of your main CMakeLists.txt")
+    endif()
+    if(CMAKE_VERSION VERSION_LESS 3.23)
+      message(WARNING "MdtProfiling: CMake ${CMAKE_VERSION} only provides timestamps with a resolution of 1 second")
+    endif()
+    set_property(GLOBAL PROPERTY MDT_PROFILE_REPORT_IS_SCHEDULED TRUE)
+  endif()
+  unset(mdtProfileReportIsScheduled)
+endif()
+
+
+function(mdt_profile_get_timestamp out_var)
+
+  # %f (microseconds) is only available since CMake 3.23
+  if(CMAKE_VERSION VERSION_GREATER_EQUAL 3.23)
+    string(TIMESTAMP timestamp "%s%f" UTC)
+  else()
+    string(TIMESTAMP timestamp "%s000000" UTC)
+  endif()
+
+  set(${out_var} ${timestamp} PARENT_SCOPE)
+
+endfunction()
+
+
+function(mdt_profile_record)
+
+  set(options)
+  set(oneValueArgs FUNCTION BEGIN END INPUT_SIZE)
+  set(multiValueArgs)
+  cmake_parse_arguments(ARG "${options}" "${oneValueArgs}" "${multiValueArgs}" ${ARGN})
+
+  if(NOT ARG_FUNCTION)
+    message(FATAL_ERROR "mdt_profile_record(): mandatory argument FUNCTION missing")
+  endif()
+  if(NOT ARG_BEGIN)
+    message(FATAL_ERROR "mdt_profile_record(): mandatory argument BEGIN missing")
+  endif()
+  if(ARG_UNPARSED_ARGUMENTS)
+    message(FATAL_ERROR "mdt_profile_record(): unknown arguments passed: ${ARG_UNPARSED_ARGUMENTS}")
+  endif()
+
+  if(ARG_END)
+    set(end ${ARG_END})
+  else()
+    mdt_profile_get_timestamp(end)
+  endif()
+
+  set(inputSize 0)
+  if(ARG_INPUT_SIZE)
+    set(inputSize ${ARG_INPUT_SIZE})
+  endif()
+
+  get_property(functionIsKnown GLOBAL PROPERTY MDT_PROFILE_${ARG_FUNCTION}_CALLS SET)
+  if(NOT functionIsKnown)
+    set_property(GLOBAL APPEND PROPERTY MDT_PROFILE_FUNCTIONS ${ARG_FUNCTION})
+  endif()
+
+  set_property(GLOBAL APPEND PROPERTY MDT_PROFILE_${ARG_FUNCTION}_CALLS "${ARG_BEGIN}:${end}:${inputSize}")
+
+endfunction()
+
+
+function(mdt_write_profile_report)
+
+  set(options)
+  set(oneValueArgs FILE)
+  set(multiValueArgs)
+  cmake_parse_arguments(ARG "${options}" "${oneValueArgs}" "${multiValueArgs}" ${ARGN})
+
+  if(ARG_UNPARSED_ARGUMENTS)
+    message(FATAL_ERROR "mdt_write_profile_report(): unknown arguments passed: ${ARG_UNPARSED_ARGUMENTS}")
+  endif()
+
+  if(ARG_FILE)
+    set(reportFile "${ARG_FILE}")
+  elseif(MDT_CMAKE_MODULES_PROFILE_OUTPUT)
+    set(reportFile "${MDT_CMAKE_MODULES_PROFILE_OUTPUT}")
+  else()
+    set(reportFile "${CMAKE_BINARY_DIR}/MdtCMakeModulesProfile.csv")
+  endif()
+
+  # Items are: paddedTotalTime:function:callCount:totalTime:maxTime:inputSize
+  # The total time is left padded with zeros, so that a string sort also sorts by time
+  set(entries)
+  get_property(functions GLOBAL PROPERTY MDT_PROFILE_FUNCTIONS)
+  foreach(function ${functions})
+    get_property(calls GLOBAL PROPERTY MDT_PROFILE_${function}_CALLS)
+    set(callCount 0)
+    set(totalTime 0)
+    set(maxTime 0)
+    set(totalInputSize 0)
+    foreach(call ${calls})
+      string(REPLACE ":" ";" call "${call}")
+      list(GET call 0 begin)
+      list(GET call 1 end)
+      list(GET call 2 inputSize)
+      math(EXPR time "${end} - ${begin}")
+      math(EXPR callCount "${callCount} + 1")
+      math(EXPR totalTime "${totalTime} + ${time}")
+      math(EXPR totalInputSize "${totalInputSize} + ${inputSize}")
+      if(time GREATER maxTime)
+        set(maxTime ${time})
+      endif()
+    endforeach()
+    set(paddedTotalTime "${totalTime}")
+    string(LENGTH "${paddedTotalTime}" length)
+    while(length LESS 20)
+      string(PREPEND paddedTotalTime "0")
+      math(EXPR length "${length} + 1")
+    endwhile()
+    list(APPEND entries "${paddedTotalTime}:${function}:${callCount}:${totalTime}:${maxTime}:${totalInputSize}")
+  endforeach()
+
+  list(SORT entries ORDER DESCENDING)
+
+  get_filename_component(reportFileExtension "${reportFile}" LAST_EXT)
+  string(TOLOWER "${reportFileExtension}" reportFileExtension)
+
+  if(reportFileExtension STREQUAL ".json")
+    set(reportContent "[\n")
+    set(separator "")
+  else()
+    set(reportContent "function,calls,total_time_us,average_time_us,max_time_us,total_input_size\n")
+  endif()
+
+  foreach(entry ${entries})
+    string(REPLACE ":" ";" entry "${entry}")
+    list(GET entry 1 function)
+    list(GET entry 2 callCount)
+    list(GET entry 3 totalTime)
+    list(GET entry 4 maxTime)
+    list(GET entry 5 totalInputSize)
+    math(EXPR averageTime "${totalTime} / ${callCount}")
+    if(reportFileExtension STREQUAL ".json")
+      string(APPEND reportContent "${separator}  {\"function\": \"${function}\", \"calls\": ${callCount}, \"total_time_us\": ${totalTime}, ")
+      string(APPEND reportContent "\"average_time_us\": ${averageTime}, \"max_time_us\": ${maxTime}, \"total_input_size\": ${totalInputSize}}")
+      set(separator ",\n")
+    else()
+      string(APPEND reportContent "${function},${callCount},${totalTime},${averageTime},${maxTime},${totalInputSize}\n")
+    endif()
+  endforeach()
+
+  if(reportFileExtension STREQUAL ".json")
+    string(APPEND reportContent "\n]\n")
+  endif()
+
+  file(WRITE "${reportFile}" "${reportContent}")
+
+  message(STATUS "MdtCMakeModules profile report written to ${reportFile}")
+
+endfunction()
@@ -214,6 +214,19 @@
 #
 #   PATH=$<SHELL_PATH:$<TARGET_FILE_DIR:Mdt0::ItemEditor>>;$<SHELL_PATH:$<TARGET_FILE_DIR:Mdt0::ItemModel>>;C:\Qt\5.15.2\mingw73_64\bin
 #
+# .. command:: mdt_target_libraries_to_test_environment_string
+#
+# Get the result of :command:`mdt_target_libraries_to_library_env_path()`
+# as a string that can be passed to the ``ENVIRONMENT`` property of a test::
+#
+#   mdt_target_libraries_to_test_environment_string(<out_var> TARGET <target>)
+#
+# On Windows, the ``;`` that separates the paths are escaped,
+# so that ``PATH`` is seen as a single variable by the ``ENVIRONMENT`` property.
+#
+# This is what :command:`mdt_set_test_library_env_path()` passes
+# to :command:`mdt_append_test_environment_variables_string()`.
+#
 #
 # When using the Conan package manager, the `conanbuildinfo.txt` can also be used.
 # On Unix, the paths of the `[libdirs]` section will be added,
@@ -431,6 +444,7 @@
 
 include(MdtTargetDependenciesHelpers)
 include(MdtConanBuildInfoReader)
+include(MdtProfiling)
 
 
 function(mdt_append_test_environment_variables_string test_name)
@@ -457,6 +471,10 @@ endfunction()
 
 function(mdt_target_libraries_to_library_env_path out_var)
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    mdt_profile_get_timestamp(profileBegin)
+  endif()
+
   set(options ALWAYS_USE_SLASHES)
   set(oneValueArgs TARGET)
   set(multiValueArgs "")
@@ -544,6 +562,35 @@ function(mdt_target_libraries_to_library_env_path out_var)
 
   set(${out_var} ${envPath} PARENT_SCOPE)
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    list(LENGTH sharedLibrariesDependencies sharedLibrariesDependenciesCount)
+    mdt_profile_record(FUNCTION mdt_target_libraries_to_library_env_path BEGIN ${profileBegin} INPUT_SIZE ${sharedLibrariesDependenciesCount})
+  endif()
+
+endfunction()
+
+
+function(mdt_target_libraries_to_test_environment_string out_var)
+
+  set(options "")
+  set(oneValueArgs TARGET)
+  set(multiValueArgs "")
+  cmake_parse_arguments(ARG "${options}" "${oneValueArgs}" "${multiValueArgs}" ${ARGN})
+
+  if(NOT TARGET ${ARG_TARGET})
+    message(FATAL_ERROR "mdt_target_libraries_to_test_environment_string(): ${ARG_TARGET} is not a valid target")
+  endif()
+  if(ARG_UNPARSED_ARGUMENTS)
+    message(FATAL_ERROR "mdt_target_libraries_to_test_environment_string(): unknown arguments passed: ${ARG_UNPARSED_ARGUMENTS}")
+  endif()
+
+  mdt_target_libraries_to_library_env_path(envPath TARGET ${ARG_TARGET})
+  if(WIN32)
+    string(REPLACE ";" "\\;" envPath "${envPath}")
+  endif()
+
+  set(${out_var} "${envPath}" PARENT_SCOPE)
+
 endfunction()
 
 
@@ -564,10 +611,7 @@ function(mdt_set_test_library_env_path)
     message(FATAL_ERROR "mdt_set_test_library_env_path(): unknown arguments passed: ${ARG_UNPARSED_ARGUMENTS}")
   endif()
 
-  mdt_target_libraries_to_library_env_path(envPath TARGET ${ARG_TARGET})
-  if(WIN32)
-    string(REPLACE ";" "\\;" envPath "${envPath}")
-  endif()
+  mdt_target_libraries_to_test_environment_string(envPath TARGET ${ARG_TARGET})
   if(envPath)
 #     set_tests_properties(${ARG_NAME} PROPERTIES ENVIRONMENT "${envPath}")
     mdt_append_test_environment_variables_string(${ARG_NAME} "${envPath}")
@@ -2,6 +2,7 @@
 # file Copyright.txt or https://cmake.org/licensing for details.
 
 include(MdtTargetProperties)
+include(MdtProfiling)
 
 
 function(mdt_append_shared_libraries_targets_to_list listVarName outList)
@@ -173,6 +174,10 @@ endmacro()
 
 function(mdt_collect_shared_libraries_targets_target_depends_on outDependencies)
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    mdt_profile_get_timestamp(profileBegin)
+  endif()
+
   set(options "")
   set(oneValueArgs TARGET)
   set(multiValueArgs "")
@@ -199,4 +204,9 @@ function(mdt_collect_shared_libraries_targets_target_depends_on outDependencies)
 
   set(${outDependencies} ${foundDependnecies} PARENT_SCOPE)
 
+  if(MDT_CMAKE_MODULES_PROFILE)
+    list(LENGTH foundDependnecies foundDependenciesCount)
+    mdt_profile_record(FUNCTION mdt_collect_shared_libraries_targets_target_depends_on BEGIN ${profileBegin} INPUT_SIZE ${foundDependenciesCount})
+  endif()
+
 endfunction()
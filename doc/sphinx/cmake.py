@@ -342,6 +342,17 @@ class CMakeXRefTransform(Transform):
     def apply(self):
         env = self.document.settings.env
 
+        # Index entries for references can be disabled altogether
+        # (see cmake_xref_index_entries in setup() below).
+        if not env.config.cmake_xref_index_entries:
+            return
+
+        # Objects of this document that already got an index entry.
+        # A object referenced many times in a document gets only one
+        # index entry and target, so the output grows with the count
+        # of distinct objects, not with the count of references.
+        indexed_objects = set()
+
         # Find CMake cross-reference nodes and add index and target
         # nodes for them.
         for ref in self.document.traverse(addnodes.pending_xref):
@@ -354,6 +365,10 @@ class CMakeXRefTransform(Transform):
                 continue
 
             objname = ref['reftarget']
+            if (objtype, objname) in indexed_objects:
+                continue
+            indexed_objects.add((objtype, objname))
+
             targetnum = env.new_serialno('index-%s:%s' % (objtype, objname))
 
             targetid = 'index-%s-%s:%s' % (targetnum, objtype, objname)
@@ -446,6 +461,9 @@ class CMakeDomain(Domain):
             yield (refname, refname, type, docname, refname, 1)
 
 def setup(app):
+    # If False, references (like :command:`mdt_add_test()`) do not get
+    # index entries, only the described objects do.
+    app.add_config_value('cmake_xref_index_entries', True, 'env')
     app.add_directive('cmake-module', CMakeModule)
     app.add_transform(CMakeTransform)
     app.add_transform(CMakeXRefTransform)
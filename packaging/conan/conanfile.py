@@ -1,19 +1,49 @@
 from conans import ConanFile, tools
-from conan.tools.cmake import CMake, CMakeToolchain
 import os
+import re
+
+# This package only contains CMake modules and CMake package config files.
+# Instead of configuring, building and installing the project with CMake
+# (which requires settings and a compiler, just to copy some files),
+# the files are copied and generated here.
+#
+# The result must be the same than installing the project with CMake
+# (with INSTALL_CONAN_PACKAGE_FILES=ON).
+# This is checked by test_package_files.
+#
+# Generated files are based on mdt_install_cmake_modules(),
+# mdt_install_namespace_package_config_file() and configure_package_config_file().
+
+# Same as configure_file(... @ONLY)
+def _configure_at_only(content, variables):
+  return re.sub(r'@([A-Za-z0-9_]+)@', lambda m: variables.get(m.group(1), ""), content)
+
+# Same as @PACKAGE_INIT@ expanded by configure_package_config_file(... NO_SET_AND_CHECK_MACRO NO_CHECK_REQUIRED_COMPONENTS_MACRO)
+# package_relative_path is the path from the destination of the file to the install prefix
+def _package_init(input_file_name, package_relative_path):
+  package_init = "\n"
+  package_init += "####### Expanded from @PACKAGE_INIT@ by configure_package_config_file() #######\n"
+  package_init += "####### Any changes to this file will be overwritten by the next CMake run ####\n"
+  package_init += "####### The input file was %s                            ########\n" % input_file_name
+  package_init += "\n"
+  package_init += "get_filename_component(PACKAGE_PREFIX_DIR \"${CMAKE_CURRENT_LIST_DIR}/%s\" ABSOLUTE)\n" % package_relative_path
+  package_init += "\n"
+  package_init += "####################################################################################"
+  return package_init
+
 
 class MdtCMakeModulesConan(ConanFile):
   name = "MdtCMakeModules"
   license = "BSD 3-Clause"
   url = "https://gitlab.com/scandyna/mdt-cmake-modules"
   description = "Some CMake modules used in \"Multi Dev Tools\" projects"
-  # Using CMakeToolchain and the new CMake helper
-  # should help to have a more unified build.
-  # But, it requires the settings.
-  # So, add them here and erase them in the package_id()
-  settings = "os", "arch", "compiler", "build_type"
-  #exports_sources = "Modules/*", "CMakeLists.txt", "MdtCMakeModulesConfig.cmake.in", "LICENSE", "mdt_cmake_modules-conan-cmake-modules.cmake"
-  generators = "CMakeToolchain"
+  # Nothing is built, so no settings are required
+  no_copy_source = True
+
+  # Must match the arguments passed to mdt_install_cmake_modules() in the project's CMakeLists.txt
+  _package_name = "MdtCMakeModules"
+  _install_namespace = "Mdt0"
+  _modules_path_variable_name = "MDT_CMAKE_MODULES_PATH"
 
   # The version can be set on the command line:
   # conan create . x.y.z@scandyna/testing ...
@@ -35,23 +65,98 @@ class MdtCMakeModulesConan(ConanFile):
   # and https://github.com/conan-io/conan/pull/2676
   def export_sources(self):
     self.copy("*", src="../../Modules", dst="Modules")
-    self.copy("CMakeLists.txt", src="../../", dst=".")
     self.copy("LICENSE", src="../../", dst=".")
 
-  def generate(self):
-    tc = CMakeToolchain(self)
-    tc.variables["FROM_CONAN_PROJECT_VERSION"] = self.version
-    tc.variables["INSTALL_CONAN_PACKAGE_FILES"] = "ON"
-    tc.generate()
+  def _save(self, relative_path, content):
+    # tools.save() does not translate line endings, like CMake does not
+    tools.save(os.path.join(self.package_folder, relative_path), content)
 
-  def build(self):
-    cmake = CMake(self)
-    cmake.configure()
-    cmake.build()
+  def _find_path_in_list_content(self, function_name):
+    content_in = tools.load(os.path.join(self.source_folder, "Modules", "MdtFindPathInList.cmake.in"))
+    return _configure_at_only(content_in, {"MdtFindPathInList_FUNCTION_NAME": function_name})
+
+  def _package_file_content(self, find_path_in_list_function_name):
+    content_in = "@PACKAGE_INIT@\n\n"
+    content_in += "include(\"${CMAKE_CURRENT_LIST_DIR}/%sMdtFindPathInList.cmake\")\n\n" % self._package_name
+    content_in += "# Add to CMAKE_MODULE_PATH if not allready\n"
+    content_in += "%s(CMAKE_MODULE_PATH \"@PACKAGE_modulesInstallDir@\" MDT_CMAKE_MODULES_PATH_INDEX)\n" % find_path_in_list_function_name
+    content_in += "if(${MDT_CMAKE_MODULES_PATH_INDEX} LESS 0)\n"
+    content_in += "  list(APPEND CMAKE_MODULE_PATH \"@PACKAGE_modulesInstallDir@\")\n"
+    content_in += "endif()\n\n"
+    content_in += "unset(MDT_CMAKE_MODULES_PATH_INDEX)\n"
+    content_in += "\n# Make path to the modules available to the users of this package\n"
+    content_in += "set(%s \"@PACKAGE_modulesInstallDir@\")\n" % self._modules_path_variable_name
+    return _configure_at_only(content_in, {
+      "PACKAGE_INIT": _package_init("%s.cmake.in" % self._package_name, "../"),
+      "PACKAGE_modulesInstallDir": "${PACKAGE_PREFIX_DIR}/Modules"
+    })
+
+  def _conan_package_file_content(self, find_path_in_list_function_name):
+    content_in = "@PACKAGE_INIT@\n\n"
+    content_in += "# This file is only used by conan generators that generates CMake package config files\n\n"
+    content_in += "include(\"@PACKAGE_packageConfigInstallDir@/%sMdtFindPathInList.cmake\")\n\n" % self._package_name
+    content_in += "# Remove the root of the package from CMAKE_PREFIX_PATH\n"
+    content_in += "# to avoid clashes when using Conan generated CMake package config files\n"
+    content_in += "%s(CMAKE_PREFIX_PATH \"${PACKAGE_PREFIX_DIR}\" PATH_INDEX)\n" % find_path_in_list_function_name
+    content_in += "if(${PATH_INDEX} GREATER_EQUAL 0)\n"
+    content_in += "  list(REMOVE_AT CMAKE_PREFIX_PATH ${PATH_INDEX})\n"
+    content_in += "endif()\n\n"
+    content_in += "# Add the path to our CMake modules if not already\n"
+    content_in += "%s(CMAKE_MODULE_PATH \"@PACKAGE_modulesInstallDir@\" PATH_INDEX)\n" % find_path_in_list_function_name
+    content_in += "if(${PATH_INDEX} LESS 0)\n"
+    content_in += "  list(APPEND CMAKE_MODULE_PATH \"@PACKAGE_modulesInstallDir@\")\n"
+    content_in += "endif()\n\n"
+    content_in += "unset(PATH_INDEX)\n"
+    content_in += "\n# Make path to the modules available to the users of this package\n"
+    content_in += "set(%s \"@PACKAGE_modulesInstallDir@\")\n" % self._modules_path_variable_name
+    return _configure_at_only(content_in, {
+      "PACKAGE_INIT": _package_init("%s-conan-cmake-modules.cmake.in" % self._package_name.lower(), ""),
+      "PACKAGE_packageConfigInstallDir": "${PACKAGE_PREFIX_DIR}/cmake",
+      "PACKAGE_modulesInstallDir": "${PACKAGE_PREFIX_DIR}/Modules"
+    })
+
+  def _namespace_package_config_file_content(self):
+    ns = self._install_namespace
+    content = "if(NOT %s_FIND_COMPONENTS)\n" % ns
+    content += "  set(%s_NOT_FOUND_MESSAGE \"The %s package requires at least one component\")\n" % (ns, ns)
+    content += "  set(%s_FOUND False)\n" % ns
+    content += "  return()\n"
+    content += "endif()\n"
+    content += "\n"
+    content += "foreach(component ${%s_FIND_COMPONENTS})\n" % ns
+    content += "  find_package(\n"
+    content += "    %s${component}\n" % ns
+    content += "    ${%s_FIND_VERSION}\n" % ns
+    content += "    QUIET CONFIG\n"
+    content += "    PATHS \"${CMAKE_CURRENT_LIST_DIR}/..\" NO_DEFAULT_PATH\n"
+    content += "  )\n"
+    content += "  if(NOT %s${component}_FOUND AND ${%s_FIND_REQUIRED_${component}})\n" % (ns, ns)
+    content += "    find_package(\n"
+    content += "      %s${component}\n" % ns
+    content += "      ${%s_FIND_VERSION}\n" % ns
+    content += "      QUIET CONFIG\n"
+    content += "    )\n"
+    content += "    if(NOT %s${component}_FOUND AND ${%s_FIND_REQUIRED_${component}})\n" % (ns, ns)
+    content += "      set(%s_NOT_FOUND_MESSAGE \"Failed to find %s::${component}\")\n" % (ns, ns)
+    content += "      set(%s_FOUND False)\n" % ns
+    content += "      break()\n"
+    content += "    endif()\n"
+    content += "  endif()\n"
+    content += "endforeach()\n"
+    return content
 
   def package(self):
-    cmake = CMake(self)
-    cmake.install()
+    self.copy("*", src="Modules", dst="Modules")
+
+    # MdtFindPathInList, see its documentation to understand why it is generated
+    self._save(os.path.join("Modules", "MdtFindPathInList.cmake"), self._find_path_in_list_content("mdt_find_path_in_list"))
+
+    find_path_in_list_function_name = "%s_mdt_find_path_in_list" % self._package_name
+    self._save(os.path.join("cmake", "%sMdtFindPathInList.cmake" % self._package_name), self._find_path_in_list_content(find_path_in_list_function_name))
+    self._save(os.path.join("cmake", "%s.cmake" % self._package_name), self._package_file_content(find_path_in_list_function_name))
+    self._save(os.path.join("cmake", "%sConfig.cmake" % self._package_name), "include(\"${CMAKE_CURRENT_LIST_DIR}/%s.cmake\")\n" % self._package_name)
+    self._save(os.path.join("cmake", "%sConfig.cmake" % self._install_namespace), self._namespace_package_config_file_content())
+    self._save("%s-conan-cmake-modules.cmake" % self._package_name.lower(), self._conan_package_file_content(find_path_in_list_function_name))
 
   def package_id(self):
     self.info.header_only()
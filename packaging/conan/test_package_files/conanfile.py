@@ -0,0 +1,48 @@
+from conans import ConanFile, CMake, tools
+from conans.errors import ConanException
+import filecmp
+import os
+
+# The package recipe does not use CMake to install the files.
+# Here we install the project with CMake and check that the result is the same than the package.
+class MdtCMakeModulesTestConan(ConanFile):
+  settings = "os", "compiler", "build_type", "arch"
+
+  def _cmake_install_folder(self):
+    return os.path.join(self.build_folder, "cmake_install")
+
+  def build(self):
+    cmake = CMake(self)
+    cmake.definitions["FROM_CONAN_PROJECT_VERSION"] = "0.0.0"
+    cmake.definitions["INSTALL_CONAN_PACKAGE_FILES"] = "ON"
+    cmake.definitions["CMAKE_INSTALL_PREFIX"] = self._cmake_install_folder()
+    cmake.configure(source_folder="../../..", build_folder="cmake_build")
+    cmake.install()
+
+  def _list_files(self, root):
+    files = set()
+    for dir_path, dir_names, file_names in os.walk(root):
+      for file_name in file_names:
+        files.add(os.path.relpath(os.path.join(dir_path, file_name), root))
+    return files
+
+  def test(self):
+    package_folder = self.deps_cpp_info["MdtCMakeModules"].rootpath
+    cmake_install_folder = self._cmake_install_folder()
+
+    # Files added by Conan
+    package_files = self._list_files(package_folder) - {"conaninfo.txt", "conanmanifest.txt"}
+    cmake_install_files = self._list_files(cmake_install_folder)
+
+    errors = []
+    for file in sorted(cmake_install_files - package_files):
+      errors.append("missing in package: %s" % file)
+    for file in sorted(package_files - cmake_install_files):
+      errors.append("not installed by CMake: %s" % file)
+    for file in sorted(package_files & cmake_install_files):
+      if not filecmp.cmp(os.path.join(package_folder, file), os.path.join(cmake_install_folder, file), shallow=False):
+        errors.append("content differs: %s" % file)
+
+    if errors:
+      raise ConanException("package differs from CMake install:\n  %s" % "\n  ".join(errors))
+    self.output.info("package is the same than CMake install (%s files)" % len(package_files))
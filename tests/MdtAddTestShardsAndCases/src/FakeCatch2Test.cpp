@@ -0,0 +1,44 @@
+#include "FakeTestFramework.h"
+#include <iostream>
+#include <string>
+
+/*
+ * Fakes the command line interface of a Catch2 (v2) executable:
+ *  --list-test-names-only : lists the test cases and returns their count
+ *  "Case A,Case \[C\]" : runs given test cases (\ escapes the next character)
+ */
+int main(int argc, char **argv)
+{
+  const auto testCases = fakeCatch2TestCases();
+
+  if( (argc == 2) && (std::string(argv[1]) == "--list-test-names-only") ){
+    for(const auto & testCase : testCases){
+      std::cout << testCase << std::endl;
+    }
+    return static_cast<int>( testCases.size() );
+  }
+
+  if(argc != 2){
+    std::cerr << "Expected exactly 1 test spec" << std::endl;
+    return 1;
+  }
+
+  const std::string spec = argv[1];
+  std::string name;
+  for(std::size_t i = 0; i <= spec.size(); ++i){
+    if( (i == spec.size()) || (spec[i] == ',') ){
+      if( !fakeTestCaseExists(testCases, name) ){
+        return 1;
+      }
+      std::cout << "Passed: " << name << std::endl;
+      name.clear();
+    }else if( (spec[i] == '\\') && (i + 1 < spec.size()) ){
+      ++i;
+      name += spec[i];
+    }else{
+      name += spec[i];
+    }
+  }
+
+  return 0;
+}
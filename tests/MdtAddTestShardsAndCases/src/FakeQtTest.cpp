@@ -0,0 +1,39 @@
+#include "FakeTestFramework.h"
+#include <cstdlib>
+#include <iostream>
+#include <string>
+
+/*
+ * Fakes the command line interface of a Qt Test executable:
+ *  -functions : lists the test functions
+ *  testA testB : runs given test functions
+ *
+ * If REQUIRE_FAKE_EMULATOR is defined, fails if not run by the fake emulator
+ */
+int main(int argc, char **argv)
+{
+#ifdef REQUIRE_FAKE_EMULATOR
+  if(std::getenv("MDT_FAKE_EMULATOR") == nullptr){
+    std::cerr << "Not run by the fake emulator" << std::endl;
+    return 1;
+  }
+#endif
+
+  const auto functions = fakeQtTestFunctions();
+
+  if( (argc == 2) && (std::string(argv[1]) == "-functions") ){
+    for(const auto & function : functions){
+      std::cout << function << "()" << std::endl;
+    }
+    return 0;
+  }
+
+  for(int i = 1; i < argc; ++i){
+    if( !fakeTestCaseExists(functions, argv[i]) ){
+      return 1;
+    }
+    std::cout << "PASS   : " << argv[i] << "()" << std::endl;
+  }
+
+  return 0;
+}
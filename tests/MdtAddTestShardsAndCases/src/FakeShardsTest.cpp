@@ -0,0 +1,35 @@
+#include "FakeTestFramework.h"
+#include <cstdlib>
+#include <iostream>
+
+#ifndef EXPECTED_SHARD_COUNT
+ #define EXPECTED_SHARD_COUNT 3
+#endif
+
+/*
+ * Checks that the shard environment variables are set
+ */
+int main()
+{
+  const char *indexStr = std::getenv("MDT_TEST_SHARD_INDEX");
+  const char *countStr = std::getenv("MDT_TEST_SHARD_COUNT");
+
+  if( (indexStr == nullptr) || (countStr == nullptr) ){
+    std::cerr << "MDT_TEST_SHARD_INDEX or MDT_TEST_SHARD_COUNT not set" << std::endl;
+    return 1;
+  }
+
+  const int index = std::atoi(indexStr);
+  const int count = std::atoi(countStr);
+  if( (count != EXPECTED_SHARD_COUNT) || (index < 0) || (index >= count) ){
+    std::cerr << "Invalid shard " << index << "/" << count << std::endl;
+    return 1;
+  }
+
+  const auto functions = fakeQtTestFunctions();
+  for(std::size_t i = index; i < functions.size(); i += count){
+    std::cout << "PASS   : " << functions[i] << "()" << std::endl;
+  }
+
+  return 0;
+}
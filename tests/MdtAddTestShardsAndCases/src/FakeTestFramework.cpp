@@ -0,0 +1,23 @@
+#include "FakeTestFramework.h"
+#include <algorithm>
+#include <iostream>
+
+std::vector<std::string> fakeQtTestFunctions()
+{
+  return {"testA", "testB", "testC", "testD", "testE"};
+}
+
+std::vector<std::string> fakeCatch2TestCases()
+{
+  return {"Case A", "Case B, with comma", "Case [C]", "Case D", "Case [E", "Case F]"};
+}
+
+bool fakeTestCaseExists(const std::vector<std::string> & names, const std::string & name)
+{
+  if( std::find(names.cbegin(), names.cend(), name) == names.cend() ){
+    std::cerr << "Unknown test case: '" << name << "'" << std::endl;
+    return false;
+  }
+
+  return true;
+}
@@ -0,0 +1,21 @@
+#ifndef FAKE_TEST_FRAMEWORK_H
+#define FAKE_TEST_FRAMEWORK_H
+
+#include <string>
+#include <vector>
+
+/*
+ * Helpers to fake the command line interface
+ * of some test frameworks, like Qt Test or Catch2
+ */
+
+std::vector<std::string> fakeQtTestFunctions();
+
+std::vector<std::string> fakeCatch2TestCases();
+
+/*
+ * Returns true if name is in names, otherwise prints a error and returns false
+ */
+bool fakeTestCaseExists(const std::vector<std::string> & names, const std::string & name);
+
+#endif // #ifndef FAKE_TEST_FRAMEWORK_H
@@ -0,0 +1,26 @@
+# Distributed under the OSI-approved BSD 3-Clause License.  See accompanying
+# file Copyright.txt or https://cmake.org/licensing for details.
+
+# Checks the report written at the end of the configuration
+# Each line is: function,calls,total_time_us,average_time_us,max_time_us,total_input_size
+
+if(NOT EXISTS "${REPORT_FILE}")
+  message(FATAL_ERROR "Test failed: profile report ${REPORT_FILE} was not written")
+endif()
+
+file(READ "${REPORT_FILE}" report)
+
+function(require_report_line_matches regex)
+  if(NOT report MATCHES "\n${regex}\n")
+    message(FATAL_ERROR "Test failed: no line matching '${regex}' in the report:\n${report}")
+  endif()
+endfunction()
+
+# 2 source files
+require_report_line_matches("mdt_add_test,1,[0-9]+,[0-9]+,[0-9]+,2")
+# 1 installed target
+require_report_line_matches("mdt_install_library,1,[0-9]+,[0-9]+,[0-9]+,1")
+# 1 target
+require_report_line_matches("mdt_install_package_config_file,1,[0-9]+,[0-9]+,[0-9]+,1")
+# Called by mdt_add_test()
+require_report_line_matches("mdt_target_libraries_to_library_env_path,1,[0-9]+,[0-9]+,[0-9]+,[0-9]+")
@@ -0,0 +1,4 @@
+int myLibValue()
+{
+  return 42;
+}
@@ -0,0 +1,6 @@
+int myLibValue();
+
+bool myTest()
+{
+  return myLibValue() == 42;
+}
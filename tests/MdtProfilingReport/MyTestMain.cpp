@@ -0,0 +1,6 @@
+bool myTest();
+
+int main()
+{
+  return myTest() ? 0 : 1;
+}